@@ -1,10 +1,432 @@
 import os
 import sys
+import ctypes
 import argparse
-from termcolor import colored
-import adios2 as ad
+import threading
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain, repeat
 import numpy as np
 
+# Upper bound on the bytes of a batch of small variables read at once per output. Every
+# batch allocates fresh arrays for its reads, and larger batches spend more on faulting
+# in that memory than they save on reads.
+CHUNK_BYTES = 2 * 1024 * 1024
+
+# Size of the slabs larger variables are read in per output, small enough for the
+# slabs and scratch buffers of a comparison to stay in cache between passes
+SLAB_BYTES = 1024 * 1024
+
+
+def _use_color():
+    """
+    Decide whether to style the report, following the environment variables termcolor
+    honours: ANSI_COLORS_DISABLED and NO_COLOR turn colour off, FORCE_COLOR turns it on
+    even when piped, and otherwise stdout must be a terminal other than TERM=dumb.
+    """
+    if "ANSI_COLORS_DISABLED" in os.environ or "NO_COLOR" in os.environ:
+        return False
+    if "FORCE_COLOR" in os.environ:
+        return True
+    if os.environ.get("TERM") == "dumb":
+        return False
+    return sys.stdout.isatty()
+
+
+# ANSI styles for the report, disabled unless colour is wanted
+_COLOR = _use_color()
+BOLD = "\x1b[1m" if _COLOR else ""
+RED_BOLD = "\x1b[1;31m" if _COLOR else ""
+YELLOW_BOLD = "\x1b[1;33m" if _COLOR else ""
+BLUE_BOLD = "\x1b[1;34m" if _COLOR else ""
+RESET = "\x1b[0m" if _COLOR else ""
+
+# Prefixes of the report lines
+NOATT_PREFIX = f"{YELLOW_BOLD}NOATT: {RESET}"
+NOVAR_PREFIX = f"{YELLOW_BOLD}NOVAR: {RESET}"
+DIFF_PREFIX = f"{RED_BOLD}DIFF:  {RESET}"
+ERROR_PREFIX = f"{RED_BOLD}ERROR: {RESET}"
+PASS_PREFIX = f"{BLUE_BOLD}PASS:  {RESET}"
+
+# ADIOS types of the integer attributes, whose metadata values are printed exactly
+INTEGER_TYPES = {
+    "char": np.int8, "int8_t": np.int8, "int16_t": np.int16, "int32_t": np.int32, "int64_t": np.int64,
+    "uint8_t": np.uint8, "uint16_t": np.uint16, "uint32_t": np.uint32, "uint64_t": np.uint64,
+}
+
+# libc memcmp for byte for byte comparisons of identical arrays, where available
+try:
+    _memcmp = ctypes.CDLL(None).memcmp
+    _memcmp.argtypes = (ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t)
+    _memcmp.restype = ctypes.c_int
+except (OSError, AttributeError, TypeError):
+    _memcmp = None
+
+# Scratch buffers for array comparisons, kept per thread and reused across calls
+_scratch = threading.local()
+
+
+def _scratch_buffer(shape, dtype, slot=0):
+    """
+    Return a scratch array of the given shape and dtype. The memory is allocated on
+    first use, grown when a larger array comes along and reused otherwise. Arrays
+    needed at the same time use different slots.
+    """
+    size = int(np.prod(shape))
+    buffers = _scratch.__dict__.setdefault("buffers", {})
+    buf = buffers.get((dtype, slot))
+    if buf is None or buf.size < size:
+        buf = buffers[(dtype, slot)] = np.empty(size, dtype=dtype)
+    return buf[:size].reshape(shape)
+
+
+def _equal_arrays(arr1, arr2):
+    """
+    Check if two arrays of the same shape are identical. Contiguous arrays of the same
+    dtype are compared byte for byte with memcmp, others with `np.array_equal`.
+    """
+    if (_memcmp is not None and arr1.dtype == arr2.dtype and not arr1.dtype.hasobject
+            and arr1.flags.c_contiguous and arr2.flags.c_contiguous):
+        return _memcmp(arr1.ctypes.data, arr2.ctypes.data, arr1.nbytes) == 0
+    return np.array_equal(arr1, arr2)
+
+
+def _compare_arrays(arr1, arr2, rtol, atol, need_maxdiff=True):
+    """
+    Compare two numeric arrays of the same shape in one pass over their difference.
+
+    The absolute difference is computed once and used both for the tolerance test
+    and for the max difference, instead of having `np.allclose` and the max
+    difference each compute it separately.
+
+    Returns:
+        tuple: (bool, max difference) where the bool indicates if values are equal.
+               The max difference is 0 unless need_maxdiff is set.
+    """
+    # Without tolerances only exactly equal values pass, which needs no arithmetic
+    if not rtol and not atol and not need_maxdiff:
+        return bool(np.array_equal(arr1, arr2, equal_nan=True)), 0
+
+    dtype = np.result_type(arr1, arr2)
+    if dtype.kind in "iu":
+        # Integer differences wrap around in the type of the data, but the larger minus
+        # the smaller value is exact when read back as unsigned of the same width
+        diff = np.maximum(arr1, arr2, out=_scratch_buffer(arr1.shape, dtype))
+        diff -= np.minimum(arr1, arr2, out=_scratch_buffer(arr1.shape, dtype, slot=1))
+        diff = diff.view(f"u{dtype.itemsize}")
+    else:
+        diff = np.subtract(arr2, arr1, out=_scratch_buffer(arr1.shape, dtype))
+        np.abs(diff, out=diff)
+    maxdiff = np.max(diff, initial=0) if need_maxdiff else 0
+
+    # Exact comparisons are settled by the difference alone. Integer differences are
+    # exact too, so any nonzero difference is out of an absolute tolerance below one.
+    if not rtol and (not atol or (dtype.kind != "f" and atol < 1)):
+        same = bool(maxdiff == 0) if need_maxdiff else not diff.any()
+    elif dtype.kind == "f":
+        # Cast the tolerances so the test stays in the native width of the data
+        rtol = dtype.type(rtol)
+        atol = dtype.type(atol)
+
+        # Subtract the tolerance from the difference in place, so that the test only
+        # needs the largest excess rather than full-size temporaries for the tolerance
+        # and the comparison mask
+        if rtol:
+            tol = np.abs(arr2, out=_scratch_buffer(arr1.shape, dtype, slot=1))
+            tol *= rtol
+            tol += atol
+            diff -= tol
+        else:
+            diff -= atol
+        same = bool(np.max(diff, initial=0) <= 0)
+    else:
+        tol = atol + rtol * np.abs(arr2, dtype=np.float64) if rtol else atol
+        same = bool(np.all(diff <= tol))
+
+    # NaNs and infinities are rare, so they are only looked for once the test fails.
+    # Like `np.allclose(equal_nan=True)`, they have to match exactly, while the other
+    # entries are tested on their difference as before.
+    if not same and dtype.kind == "f":
+        finite = np.isfinite(arr1) & np.isfinite(arr2)
+        if not finite.all():
+            nonfinite = ~finite
+            same = (np.array_equal(arr1[nonfinite], arr2[nonfinite], equal_nan=True) and
+                    not np.any(diff[finite] > 0))
+
+    return same, maxdiff
+
+
+def _is_scalar(val):
+    """
+    Check for a numeric Python or numpy scalar, much cheaper than `np.isscalar`.
+    """
+    return isinstance(val, (int, float, complex, np.generic))
+
+
+def _metadata_shape(info):
+    """
+    Parse the shape of a variable from its metadata string, e.g. "200, 30".
+    """
+    return tuple(int(n) for n in info["Shape"].split(",") if n.strip())
+
+
+def read_attribute(f, attribute, info):
+    """
+    Read a numeric attribute. Integers are parsed from the metadata value, which
+    prints them exactly, e.g. "3" or "{ 1, 2, 3 }". Other types are rounded there
+    and are read from the output instead.
+
+    Returns:
+        scalar or numpy.ndarray: The attribute value, as returned by ADIOS
+    """
+    dtype = INTEGER_TYPES.get(info["Type"])
+    if dtype is None:
+        return f.read_attribute(attribute)
+    value = info["Value"]
+    values = np.array([int(n) for n in value.strip("{ }").split(",")], dtype=dtype)
+    return values if value.startswith("{") else values[0]
+
+
+def compare_values(val1, val2, rtol, atol, need_maxdiff=True):
+    """
+    Compare two values (scalars or arrays) using specified tolerances. NaNs are
+    considered equal to NaNs in the same place, as identical outputs should pass.
+
+    Returns:
+        tuple: (bool, max difference) where the bool indicates if values are equal.
+               The max difference of arrays is 0 unless need_maxdiff is set.
+    """
+    # Unwrap 0-d arrays so that they are compared as scalars
+    if getattr(val1, "ndim", None) == 0:
+        val1 = val1[()]
+    if getattr(val2, "ndim", None) == 0:
+        val2 = val2[()]
+
+    # Handle string comparison, strings have no difference to measure
+    if isinstance(val1, str) and isinstance(val2, str):
+        return val1 == val2, 0
+
+    # Handle scalar comparison, integers as Python ints which cannot wrap around
+    if _is_scalar(val1) and _is_scalar(val2):
+        if isinstance(val1, np.integer):
+            val1 = int(val1)
+        if isinstance(val2, np.integer):
+            val2 = int(val2)
+        maxdiff = abs(val2 - val1)
+        same = (val1 == val2 or (val1 != val1 and val2 != val2) or
+                maxdiff < np.inf and maxdiff <= atol + rtol * abs(val2))
+        return bool(same), maxdiff
+
+    # Handle array comparison
+    elif isinstance(val1, np.ndarray) and isinstance(val2, np.ndarray):
+        if val1.shape != val2.shape:
+            return False, None
+        # Identical outputs are the common case, settle them without any arithmetic
+        elif _equal_arrays(val1, val2):
+            return True, 0
+        elif val1.dtype.kind in "fiu" and val2.dtype.kind in "fiu":
+            return _compare_arrays(val1, val2, rtol, atol, need_maxdiff)
+        elif need_maxdiff:
+            return np.allclose(val1, val2, rtol=rtol, atol=atol, equal_nan=True), np.max(np.abs(val2 - val1))
+        else:
+            return np.allclose(val1, val2, rtol=rtol, atol=atol, equal_nan=True), 0
+
+    # Incompatible types
+    return False, None
+
+
+def read_slabs(f1, f2, var1, var2):
+    """
+    Read matching pieces of a variable from both outputs, one step at a time.
+    Global arrays are split into slabs and read into two reusable buffers of at most
+    SLAB_BYTES each. A slab is a run of indices along the outermost dimension whose
+    trailing block fits in SLAB_BYTES, with single indices along the dimensions before
+    it. Scalars, local values and strings are read whole.
+
+    Yields:
+        tuple: (slab from output 1, slab from output 2)
+    """
+    shape = var1.shape()
+    steps = range(var1.steps())
+    if not shape or var1.type() == "string":
+        for step in steps:
+            yield f1.read(var1, step_selection=[step, 1]), f2.read(var2, step_selection=[step, 1])
+        return
+
+    import adios2 as ad
+
+    # Find the dimension to split along and size the slabs to stay within SLAB_BYTES
+    itemsize = max(var1.sizeof(), var2.sizeof())
+    axis = 0
+    while axis < len(shape) - 1 and int(np.prod(shape[axis + 1:])) * itemsize > SLAB_BYTES:
+        axis += 1
+    outer_shape, nrows, row_shape = shape[:axis], shape[axis], shape[axis + 1:]
+    rows = max(1, min(nrows, SLAB_BYTES // max(1, int(np.prod(row_shape)) * itemsize)))
+    buf_shape = [1] * axis + [rows] + row_shape
+    buf1 = np.empty(buf_shape, dtype=ad.type_adios_to_numpy(var1.type()))
+    buf2 = np.empty(buf_shape, dtype=ad.type_adios_to_numpy(var2.type()))
+
+    # Bind everything that does not change between slabs outside of the loop
+    outer_count = [1] * axis
+    outer_slice = (slice(None),) * axis
+    row_offset = [0] * len(row_shape)
+    read1 = f1.read_in_buffer
+    read2 = f2.read_in_buffer
+
+    for step in steps:
+        step_selection = [step, 1]
+        for outer in np.ndindex(*outer_shape):
+            for start in range(0, nrows, rows):
+                n = min(rows, nrows - start)
+                offset = list(outer) + [start] + row_offset
+                count = outer_count + [n] + row_shape
+                slab1 = buf1[outer_slice + (slice(n),)]
+                slab2 = buf2[outer_slice + (slice(n),)]
+                read1(var1, slab1, start=offset, count=count, step_selection=step_selection)
+                read2(var2, slab2, start=offset, count=count, step_selection=step_selection)
+                yield slab1, slab2
+
+
+def _compare_slabs(slabs, rtol, atol, need_maxdiff):
+    """
+    Combine the comparisons of matching slabs of a variable into one result. Once a
+    difference is found the remaining slabs are only read if the max difference is
+    needed.
+
+    Returns:
+        tuple: (bool, max difference) where the bool indicates if values are equal.
+    """
+    same, maxdiff = True, 0
+    for slab1, slab2 in slabs:
+        slab_same, slab_maxdiff = compare_values(slab1, slab2, rtol, atol, need_maxdiff)
+        if slab_maxdiff is None:
+            return False, None
+        same = same and slab_same
+        maxdiff = np.maximum(maxdiff, slab_maxdiff)
+        if not same and not need_maxdiff:
+            break
+
+    return same, maxdiff
+
+
+def _complete_batch(f1, f2, batch, rtol, atol, need_maxdiff, executor):
+    """
+    Perform the deferred reads of a batch of variables and compare them. Once read,
+    the variables are compared by the executor's threads if one is given, since numpy
+    releases the GIL while it works through the arrays.
+
+    Returns:
+        list: (bool, max difference) for each variable of the batch
+    """
+    if not batch:
+        return []
+    f1.read_complete()
+    f2.read_complete()
+
+    def compare(pair):
+        return compare_values(*pair, rtol, atol, need_maxdiff)
+
+    if executor is not None and len(batch) > 1:
+        return list(executor.map(compare, batch))
+    return [compare(pair) for pair in batch]
+
+
+def compare_variables(f1, f2, variables, rtol, atol, need_maxdiff, threads=1):
+    """
+    Compare variables present in both outputs across all of their steps.
+
+    Variables whose steps fit in SLAB_BYTES are read with deferred reads, and each
+    output completes them with a single PerformGets per batch of up to CHUNK_BYTES
+    instead of one synchronous read per variable, and the variables of a batch are
+    compared by up to `threads` threads. The threads are started once for all of the
+    batches, so that they keep their scratch buffers. Larger variables are compared
+    slab by slab without loading them whole.
+
+    Yields:
+        tuple: (bool, max difference) for each variable in order. The max difference
+               is None if shapes or step counts are inconsistent.
+    """
+    with ThreadPoolExecutor(max_workers=threads) if threads > 1 else nullcontext() as executor:
+        batch, batch_bytes = [], 0
+        for variable in variables:
+            var1 = f1.inquire_variable(variable)
+            var2 = f2.inquire_variable(variable)
+            shape, steps = var1.shape(), var1.steps()
+            consistent = shape == var2.shape() and steps == var2.steps()
+
+            # Queue up global arrays and single values that fit in the batch
+            nbytes = int(np.prod(shape)) * max(var1.sizeof(), var2.sizeof()) * steps
+            if consistent and (shape or var1.single_value()) and var1.type() != "string" and nbytes <= SLAB_BYTES:
+                if batch_bytes + nbytes > CHUNK_BYTES:
+                    yield from _complete_batch(f1, f2, batch, rtol, atol, need_maxdiff, executor)
+                    batch, batch_bytes = [], 0
+                batch.append((f1.read(var1, step_selection=[0, steps], defer_read=True),
+                              f2.read(var2, step_selection=[0, steps], defer_read=True)))
+                batch_bytes += nbytes
+                continue
+
+            # Results are yielded in order, so the pending batch goes first
+            yield from _complete_batch(f1, f2, batch, rtol, atol, need_maxdiff, executor)
+            batch, batch_bytes = [], 0
+
+            if not consistent:
+                yield False, None
+            else:
+                yield _compare_slabs(read_slabs(f1, f2, var1, var2), rtol, atol, need_maxdiff)
+
+        yield from _complete_batch(f1, f2, batch, rtol, atol, need_maxdiff, executor)
+
+
+# ADIOS2 bp outputs opened by a worker process for parallel variable comparisons
+_worker_outputs = None
+
+
+def _open_worker_outputs(output1, output2):
+    """
+    Open both outputs once per worker process. ADIOS2 readers cannot be shared
+    between processes, so each worker keeps its own pair for all of its variables.
+    """
+    import adios2 as ad
+
+    global _worker_outputs
+    _worker_outputs = (ad.FileReader(output1), ad.FileReader(output2))
+
+
+def _compare_variables_in_worker(variables, rtol, atol, need_maxdiff, threads):
+    """
+    Compare a group of variables using the outputs opened by the current worker process.
+    """
+    return list(compare_variables(*_worker_outputs, variables, rtol, atol, need_maxdiff, threads))
+
+
+def _validate_args(args):
+    """
+    Validate the parsed command-line arguments.
+
+    Returns:
+        argparse.Namespace: the arguments, with the ignore lists stored as sets for
+                            constant time lookups
+    """
+    # Validate the paths to the output files
+    for output in (args.output1, args.output2):
+        if not os.path.exists(output):
+            raise FileNotFoundError(f"{RED_BOLD}ERROR: Output file does not exist: {output}{RESET}")
+
+    # Validate tolerances, verbosity level and number of parallel jobs
+    checks = (
+        (args.atol < 0.0, f"Absolute tolerance cannot be negative: {args.atol}"),
+        (args.rtol < 0.0, f"Relative tolerance cannot be negative: {args.rtol}"),
+        (args.verbose not in (0, 1, 2), "Invalid verbosity level. Choose from: 0 (none), 1 (errors), 2 (all)"),
+        (args.jobs < 1, f"Number of jobs must be at least 1: {args.jobs}"),
+    )
+    for invalid, error in checks:
+        if invalid:
+            raise argparse.ArgumentTypeError(f"{RED_BOLD}ERROR: {error}{RESET}")
+
+    args.ignore_atts = set(args.ignore_atts or ())
+    args.ignore_vars = set(args.ignore_vars or ())
+    return args
+
 
 def main():
     """
@@ -14,6 +436,8 @@ def main():
 
     Floating-point comparisons are performed using numpy's `allclose` function:
         np.allclose(): abs(arr1 - arr2) <= (atol + rtol * abs(arr2))
+    with `equal_nan=True`: NaNs in the same place in both outputs are equal, and
+    infinities have to match exactly.
 
     Inspired by this gist:
         https://gist.github.com/jychoi-hpc/b4654e178edd84c9b8a2a198ab1c6c95
@@ -25,6 +449,7 @@ def main():
         -v LEVEL    Verbosity level: (0) No output, (1) Errors only, (2) All details
         -r RTOL     Relative tolerance for floating-point comparisons (default: 0.0)
         -a ATOL     Absolute tolerance for floating-point comparisons (default: 0.0)
+        -j JOBS     Number of processes comparing variables in parallel (default: 1)
         --ignore-atts IGNORE_ATTS   List of attributes to ignore
         --ignore-vars IGNORE_VARS   List of variables to ignore
 
@@ -33,7 +458,7 @@ def main():
     """
 
     # Print welcome message
-    print(colored("bpcmp: ADIOS2 bp output comparison utility\n", attrs=["bold"]))
+    print(f"{BOLD}bpcmp: ADIOS2 bp output comparison utility\n{RESET}")
 
     # Counter for the number of detected differences
     num_differences = 0
@@ -46,43 +471,19 @@ def main():
     parser.add_argument("-r", "--rtol", help="Relative tolerance (default: 0.0)", type=float, default=0.0)
     parser.add_argument("-a", "--atol", help="Absolute tolerance (default: 0.0)", type=float, default=0.0)
     parser.add_argument("-v", "--verbose", help="Verbosity level: 0, 1, or 2 (default: 0)", type=int, default=0)
+    parser.add_argument("-j", "--jobs", help="Number of processes comparing variables (default: 1)", type=int, default=1)
     parser.add_argument("--ignore-atts", help="Attributes to ignore", nargs="+", default=None)
     parser.add_argument("--ignore-vars", help="Variables to ignore", nargs="+", default=None)
 
     # Parse command-line arguments
     args = parser.parse_args()
 
-    # Validate the paths to the output files
-    if not os.path.exists(args.output1):
-        msg = colored(f"ERROR: Output file does not exist: {args.output1}", color="red", attrs=["bold"])
-        raise FileNotFoundError(msg)
-    output1 = args.output1
-
-    if not os.path.exists(args.output2):
-        msg = colored(f"ERROR: Output file does not exist: {args.output2}", color="red", attrs=["bold"])
-        raise FileNotFoundError(msg)
-    output2 = args.output2
-
-    # Validate and set tolerances
-    if args.atol < 0.0:
-        msg = colored(f"ERROR: Absolute tolerance cannot be negative: {args.atol}", color="red", attrs=["bold"])
-        raise argparse.ArgumentTypeError(msg)
-    atol = args.atol
-
-    if args.rtol < 0.0:
-        msg = colored(f"ERROR: Relative tolerance cannot be negative: {args.rtol}", color="red", attrs=["bold"])
-        raise argparse.ArgumentTypeError(msg)
-    rtol = args.rtol
-
-    # Set verbosity level
-    if args.verbose not in (0, 1, 2):
-        msg = colored("Invalid verbosity level. Choose from: 0 (none), 1 (errors), 2 (all)", color="red", attrs=["bold"])
-        raise argparse.ArgumentTypeError(msg)
-    verbose = args.verbose
-
-    # Copy ignore lists if provided
-    ignore_atts = args.ignore_atts.copy() if args.ignore_atts else []
-    ignore_vars = args.ignore_vars.copy() if args.ignore_vars else []
+    # Validate the arguments and unpack them
+    args = _validate_args(args)
+    output1, output2 = args.output1, args.output2
+    atol, rtol = args.atol, args.rtol
+    verbose, jobs = args.verbose, args.jobs
+    ignore_atts, ignore_vars = args.ignore_atts, args.ignore_vars
 
     # Display a summary of the inputs
     print(f"ADIOS2 bp output 1: {output1}")
@@ -90,156 +491,212 @@ def main():
     print(f"Absolute tolerance: {atol:e}")
     print(f"Relative tolerance: {rtol:e}")
     print(f"Verbose level: {verbose}")
+    if jobs > 1:
+        print(f"Parallel jobs: {jobs}")
     if ignore_atts:
-        print(f"Attributes to ignore: {ignore_atts}")
+        print(f"Attributes to ignore: {sorted(ignore_atts)}")
     if ignore_vars:
-        print(f"Variables to ignore: {ignore_vars}")
+        print(f"Variables to ignore: {sorted(ignore_vars)}")
     print("")
 
-    def compare_values(val1, val2):
-        """
-        Compare two values (scalars or arrays) using specified tolerances.
-
-        Returns:
-            tuple: (bool, max difference) where the bool indicates if values are equal.
-        """
-        # Handle scalar comparison
-        if np.isscalar(val1) and np.isscalar(val2):
-            return val1 == val2, abs(val2 - val1)
-
-        # Handle array comparison
-        elif isinstance(val1, np.ndarray) and isinstance(val2, np.ndarray):
-            if val1.shape == val2.shape:
-                return np.allclose(val1, val2, rtol=rtol, atol=atol), np.max(np.abs(val2 - val1))
-            else:
-                return False, None
-
-        # Incompatible types
-        return False, None
+    # Buffer the report instead of flushing stdout after every line, which dominates
+    # the run time of verbose comparisons of outputs with many entries. Replacement
+    # streams such as io.StringIO cannot be reconfigured and are left as they are.
+    sys.stdout.flush()
+    reconfigure = getattr(sys.stdout, "reconfigure", None)
+    if reconfigure is not None:
+        reconfigure(line_buffering=False, write_through=False)
 
-    # Open the ADIOS2 bp output
+    # Open the ADIOS2 bp output, adios2 is only imported once the arguments are valid
+    import adios2 as ad
     f1 = ad.FileReader(output1)
     f2 = ad.FileReader(output2)
 
+    # Fetch the attribute metadata once per output rather than once per lookup
+    atts1 = f1.available_attributes()
+    atts2 = f2.available_attributes()
+
+    # String attributes are settled from their metadata values in a single pass
+    same_strings = {attribute for attribute, info1 in atts1.items()
+                    if info1["Type"] == "string" and attribute in atts2 and
+                    info1["Value"] == atts2[attribute]["Value"]}
+
     # Compare attributes
-    for attribute in f1.available_attributes():
+    for attribute, info1 in atts1.items():
         # Skip current attribute if in the ignore list
         if attribute in ignore_atts:
             continue
 
-        # Read attribute from output 1
-        att1 = f1.available_attributes()[attribute]["Value"]
-
-        # Read attribute from output 2, report as difference if attribute does not exist
-        try:
-            att2 = f2.available_attributes()[attribute]["Value"]
-        except Exception:
+        # Report as difference if attribute does not exist in output 2
+        info2 = atts2.get(attribute)
+        if info2 is None:
             num_differences += 1
             if verbose:
-                att = colored(f"{attribute}", color="yellow", attrs=["bold"])
-                msg = (colored("NOATT: ", color="yellow", attrs=["bold"]) +
+                att = f"{YELLOW_BOLD}{attribute}{RESET}"
+                msg = (NOATT_PREFIX +
                        f"Attribute {att} found in {output1} but not {output2}")
                 print(msg)
             continue
 
-        # Compare the attributes based on types
-        if f1.available_attributes()[attribute]["Type"] == "string":
-            if att1 != att2:
+        # Compare the attributes based on types, only strings use the metadata values
+        if info1["Type"] == "string":
+            if attribute not in same_strings:
                 num_differences += 1
                 if verbose:
-                    att = colored(f"{attribute}", color="red", attrs=["bold"])
-                    msg = (colored("DIFF:  ", color="red", attrs=["bold"]) +
+                    att = f"{RED_BOLD}{attribute}{RESET}"
+                    msg = (DIFF_PREFIX +
                            f"Attribute {att} has differences: " +
-                           f"{output1} = {att1} and {output2} = {att2}")
+                           f"{output1} = {info1['Value']} and {output2} = {info2['Value']}")
                     print(msg)
             else:
                 if verbose == 2:
-                    att = colored(f"{attribute}", color="blue", attrs=["bold"])
-                    msg = (colored("PASS:  ", color="blue", attrs=["bold"]) +
+                    att = f"{BLUE_BOLD}{attribute}{RESET}"
+                    msg = (PASS_PREFIX +
                            f"Attribute {att} is the same in both outputs")
                     print(msg)
         else:
-            # Re-reading input as integer or float (could be scalars or lists)
-            att1 = f1.read_attribute(attribute)
-            att2 = f2.read_attribute(attribute)
-            same, maxdiff = compare_values(att1, att2)
+            # Read input as integer or float (could be scalars or lists)
+            att1 = read_attribute(f1, attribute, info1)
+            att2 = read_attribute(f2, attribute, info2)
+            same, maxdiff = compare_values(att1, att2, rtol, atol, verbose > 0)
             if maxdiff is None:
                 num_differences += 1
                 if verbose:
-                    att = colored(f"{attribute}", color="red", attrs=["bold"])
-                    msg = (colored("ERROR: ", color="red", attrs=["bold"]) +
+                    att = f"{RED_BOLD}{attribute}{RESET}"
+                    msg = (ERROR_PREFIX +
                            f"Attribute {att} has inconsistent types: " +
                            f"{output1} = {att1} and {output2} = {att2}")
                     print(msg)
             elif not same:
                 num_differences += 1
                 if verbose:
-                    att = colored(f"{attribute}", color="red", attrs=["bold"])
-                    msg = (colored("DIFF:  ", color="red", attrs=["bold"]) +
+                    att = f"{RED_BOLD}{attribute}{RESET}"
+                    msg = (DIFF_PREFIX +
                            f"Attribute {att} has differences, max difference: {maxdiff}")
                     print(msg)
             else:
                 if verbose == 2:
-                    msg = ""
-                    att = colored(f"{attribute}", color="blue", attrs=["bold"])
-                    msg = (colored("PASS:  ", color="blue", attrs=["bold"]) +
+                    att = f"{BLUE_BOLD}{attribute}{RESET}"
+                    msg = (PASS_PREFIX +
                            f"Attribute {att} is the same in both outputs")
                     print(msg)
 
+    # Report attributes found in output 2 but not output 1
+    for attribute in sorted(atts2.keys() - atts1.keys() - ignore_atts):
+        num_differences += 1
+        if verbose:
+            att = f"{YELLOW_BOLD}{attribute}{RESET}"
+            msg = (NOATT_PREFIX +
+                   f"Attribute {att} found in {output2} but not {output1}")
+            print(msg)
+
     # Compare variables (note that in ADIOS 2, variables cannot be strings)
-    for variable in f1.available_variables():
+    vars1 = f1.available_variables()
+    vars2 = f2.available_variables()
+    common = [variable for variable in vars1 if variable not in ignore_vars and variable in vars2]
+
+    # Prescan the metadata so that variables with inconsistent step counts, shapes or
+    # types are reported without reading any of their data
+    inconsistent = {variable for variable in common
+                    if any(vars1[variable][key] != vars2[variable][key]
+                           for key in ("AvailableStepsCount", "Shape", "Type"))}
+
+    compared = [variable for variable in common if variable not in inconsistent]
+
+    # Variables are independent, so worker processes can compare groups of them in
+    # parallel. Results come back in submission order, keeping the output deterministic.
+    # The cores are shared out between the processes for comparing batched variables.
+    threads = max(1, (os.cpu_count() or 1) // jobs)
+    if jobs > 1:
+        size = max(1, -(-len(compared) // (4 * jobs)))
+        groups = [compared[i:i + size] for i in range(0, len(compared), size)]
+
+        # Forked workers flush their inherited copy of stdout when they exit
+        sys.stdout.flush()
+        pool = ProcessPoolExecutor(max_workers=jobs, initializer=_open_worker_outputs, initargs=(output1, output2))
+        results = chain.from_iterable(pool.map(_compare_variables_in_worker, groups, repeat(rtol),
+                                               repeat(atol), repeat(verbose > 0), repeat(threads)))
+    else:
+        pool = None
+        results = compare_variables(f1, f2, compared, rtol, atol, verbose > 0, threads)
+
+    for variable in vars1:
         # Skip current variable if in the ignore list
         if variable in ignore_vars:
             continue
 
-        # Read variable from output 1
-        var1 = f1.read(variable)
-
-        # Read attribute from output 2, report as difference if attribute does not exist
-        try:
-            var2 = f2.read(variable)
-        except Exception:
+        # Report as difference if variable does not exist in output 2
+        if variable not in vars2:
             num_differences += 1
             if verbose:
-                var = colored(f"{variable}", color="yellow", attrs=["bold"])
-                msg = (colored("NOVAR: ", color="yellow", attrs=["bold"]) +
+                var = f"{YELLOW_BOLD}{variable}{RESET}"
+                msg = (NOVAR_PREFIX +
                        f"Variable {var} found in {output1} but not {output2}")
                 print(msg)
             continue
 
-        same, maxdiff = compare_values(var1, var2)
+        if variable in inconsistent:
+            same, maxdiff = False, None
+        else:
+            same, maxdiff = next(results)
         if maxdiff is None:
             num_differences += 1
             if verbose:
-                var = colored(f"{variable}", color="red", attrs=["bold"])
-                msg = (colored("ERROR: ", color="red", attrs=["bold"]) +
-                       f"Variable {var} has inconsistent shapes: " +
-                       f"{output1} = {var1.shape} and {output2} = {var2.shape}")
+                info1 = vars1[variable]
+                info2 = vars2[variable]
+                var = f"{RED_BOLD}{variable}{RESET}"
+                if info1["AvailableStepsCount"] != info2["AvailableStepsCount"]:
+                    msg = (ERROR_PREFIX +
+                           f"Variable {var} has inconsistent steps: " +
+                           f"{output1} = {info1['AvailableStepsCount']} and {output2} = {info2['AvailableStepsCount']}")
+                elif info1["Shape"] != info2["Shape"]:
+                    msg = (ERROR_PREFIX +
+                           f"Variable {var} has inconsistent shapes: " +
+                           f"{output1} = {_metadata_shape(info1)} and {output2} = {_metadata_shape(info2)}")
+                else:
+                    msg = (ERROR_PREFIX +
+                           f"Variable {var} has inconsistent types: " +
+                           f"{output1} = {info1['Type']} and {output2} = {info2['Type']}")
                 print(msg)
         elif not same:
             num_differences += 1
             if verbose:
-                var = colored(f"{variable}", color="red", attrs=["bold"])
-                msg = (colored("DIFF:  ", color="red", attrs=["bold"]) +
-                       f"Variable {var} has differences, max difference: {maxdiff}")
+                var = f"{RED_BOLD}{variable}{RESET}"
+                if vars1[variable]["Type"] == "string":
+                    msg = (DIFF_PREFIX +
+                           f"Variable {var} has differences")
+                else:
+                    msg = (DIFF_PREFIX +
+                           f"Variable {var} has differences, max difference: {maxdiff}")
                 print(msg)
         else:
             if verbose == 2:
-                msg = ""
-                var = colored(f"{variable}", color="blue", attrs=["bold"])
-                msg = (colored("PASS:  ", color="blue", attrs=["bold"]) +
+                var = f"{BLUE_BOLD}{variable}{RESET}"
+                msg = (PASS_PREFIX +
                        f"Variable {var} is the same in both outputs")
                 print(msg)
 
+    if pool is not None:
+        pool.shutdown()
+
+    # Report variables found in output 2 but not output 1
+    for variable in sorted(vars2.keys() - vars1.keys() - ignore_vars):
+        num_differences += 1
+        if verbose:
+            var = f"{YELLOW_BOLD}{variable}{RESET}"
+            msg = (NOVAR_PREFIX +
+                   f"Variable {var} found in {output2} but not {output1}")
+            print(msg)
+
     # Close the ADIOS2 output
     f1.close()
     f2.close()
 
     # Final summary of differences
     if num_differences == 0:
-        print(colored(f"{output1} and {output2} are identical", attrs=["bold"]))
+        print(f"{BOLD}{output1} and {output2} are identical{RESET}")
     else:
-        print(colored(f"{num_differences} differences found between {output1} and {output2}", attrs=["bold"]))
+        print(f"{BOLD}{num_differences} differences found between {output1} and {output2}{RESET}")
 
     sys.exit(0 if num_differences == 0 else 1)
 
@@ -1,7 +1,49 @@
 import os
 import argparse
-import adios2 as ad
-from collections import OrderedDict
+from itertools import product
+
+import numpy as np
+
+# Variables larger than this are summarized from reads of their edges only
+SUMMARY_BYTES = 1 << 20
+
+
+def read_edges(bpout, var):
+    """
+    Read only the leading and trailing entries along every dimension of a global
+    array, which is all numpy displays of a large array. The edge blocks are placed
+    around a dummy entry in each dimension that was cut, so that numpy still prints
+    the summary with "..." in its place.
+
+    Returns:
+        numpy.ndarray: The edges of the variable, to be printed summarized
+    """
+    import adios2 as ad
+
+    edge = np.get_printoptions()["edgeitems"]
+
+    # For each dimension, the (start, count) pieces to read and where they go
+    pieces = []
+    edges_shape = []
+    for n in var.shape():
+        if n > 2 * edge:
+            pieces.append([(0, edge, slice(0, edge)), (n - edge, edge, slice(edge + 1, None))])
+            edges_shape.append(2 * edge + 1)
+        else:
+            pieces.append([(0, n, slice(None))])
+            edges_shape.append(n)
+
+    # Defer the reads of all the corner blocks and perform them together
+    blocks = [(tuple(piece[2] for piece in corner),
+               bpout.read(var, start=[piece[0] for piece in corner],
+                          count=[piece[1] for piece in corner], defer_read=True))
+              for corner in product(*pieces)]
+    bpout.read_complete()
+
+    edges = np.zeros(edges_shape, dtype=ad.type_adios_to_numpy(var.type()))
+    for index, block in blocks:
+        edges[index] = block
+    return edges
 
 
 def main():
@@ -27,42 +69,46 @@ def main():
     if not os.path.exists(args.bpout):
         raise FileNotFoundError(f"ERROR: Output file does not exist: {args.bpout}")
 
-    # Open the ADIOS2 bp output using a context manager
+    # Open the ADIOS2 bp output using a context manager, adios2 is only imported
+    # once the arguments are valid
+    import adios2 as ad
     with ad.FileReader(args.bpout) as bpout:
-        bpdict = {}
-
-        # Collect attributes into the bp dictionary
         attributes = bpout.available_attributes()
-        for attribute, attr_info in attributes.items():
-            bpdict[attribute] = attr_info["Value"]
-
-        # Collect variables into the bp dictionary
-        for variable in bpout.available_variables():
-            bpdict[variable] = bpout.read(variable)
+        variables = bpout.available_variables()
 
-    # Convert the bp dictionary into an ordered dict
-    ordered_dict = OrderedDict(sorted(bpdict.items()))
+        # Index the 'description' and 'units' attributes by the entry they belong to
+        # (note that in ADIOS 2, variables cannot be strings)
+        descriptions = {key[:-len("/description")]: info["Value"]
+                        for key, info in attributes.items() if key.endswith("/description")}
+        units = {key[:-len("/units")]: info["Value"]
+                 for key, info in attributes.items() if key.endswith("/units")}
 
-    # Dump the bp output file to the screen
-    for key, item in ordered_dict.items():
         # Skip displaying 'description' and 'units' entries directly
-        if any(val in key for val in ["description", "units"]):
-            continue
-
-        # Display associated 'description' if it exists
-        if key + "/description" in ordered_dict:
-            print(f"{key + '/description':32}{ordered_dict[key + '/description']}")
-
-        # Display associated 'units' if it exists
-        if key + "/units" in ordered_dict:
-            print(f"{key + '/units':32}{ordered_dict[key + '/units']}")
-
-        # Display the actual key and value
-        print(f"{key:32}{item}\n")
-
-        # Print an extra newline for readability if 'units' are present
-        if "units" in key:
-            print("")
+        keys = sorted(key for key in attributes.keys() | variables.keys()
+                      if not any(val in key for val in ["description", "units"]))
+
+        # Dump the bp output file to the screen, reading one variable at a time
+        for key in keys:
+            # Display associated 'description' if it exists
+            if key in descriptions:
+                print(f"{key + '/description':32}{descriptions[key]}")
+
+            # Display associated 'units' if it exists
+            if key in units:
+                print(f"{key + '/units':32}{units[key]}")
+
+            # Display the actual key and value, large variables are summarized from
+            # their edges without reading the rest
+            if key in variables:
+                var = bpout.inquire_variable(key)
+                if int(np.prod(var.shape())) * var.sizeof() > SUMMARY_BYTES:
+                    with np.printoptions(threshold=0):
+                        item = str(read_edges(bpout, var))
+                else:
+                    item = bpout.read(var)
+            else:
+                item = attributes[key]["Value"]
+            print(f"{key:32}{item}\n")
 
 
 if __name__ == "__main__":
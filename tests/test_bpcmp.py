@@ -0,0 +1,99 @@
+import os
+import sys
+import subprocess
+import tempfile
+import unittest
+
+import numpy as np
+
+from bpcmp.bpcmp import INTEGER_TYPES, read_attribute
+
+try:
+    import adios2 as ad
+except ImportError:
+    ad = None
+
+
+def write_output(path, variables, blocks=1, io=None):
+    """
+    Write a one-step bp output, splitting each variable into the given number of blocks.
+    """
+    with (ad.Stream(io, path, "w") if io is not None else ad.Stream(path, "w")) as s:
+        for _ in s.steps(1):
+            for name, value in variables.items():
+                for block in np.array_split(np.arange(value.size), blocks):
+                    start, count = int(block[0]), block.size
+                    s.write(name, value[start:start + count].copy(), list(value.shape), [start], [count])
+
+
+def run_bpcmp(output1, output2, *args):
+    """
+    Run bpcmp on two outputs and return its exit code.
+    """
+    cmd = [sys.executable, "-m", "bpcmp.bpcmp", output1, output2, *args]
+    return subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode
+
+
+@unittest.skipIf(ad is None, "adios2 is not installed")
+class TestMetadataStatistics(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def assertIdentical(self, output1, output2):
+        for verbose in ("0", "1"):
+            self.assertEqual(run_bpcmp(output1, output2, "-v", verbose), 0, f"-v {verbose}")
+
+    def test_statistics_disabled(self):
+        # Without statistics, ADIOS stores placeholder min and max values
+        io = ad.Adios().declare_io("nostats")
+        io.set_parameter("StatsLevel", "0")
+        values = {"x": np.array([1.0, 2.0, 3.0])}
+        write_output(self.path("nostats.bp"), values, io=io)
+        write_output(self.path("stats.bp"), values)
+        self.assertIdentical(self.path("nostats.bp"), self.path("stats.bp"))
+
+    def test_nans_in_different_blocks(self):
+        # The min and max of data with NaNs depend on how it is split into blocks
+        values = {"x": np.array([np.nan, 1.0, 2.0, 3.0, 4.0, 5.0])}
+        write_output(self.path("one.bp"), values, blocks=1)
+        write_output(self.path("two.bp"), values, blocks=2)
+        self.assertIdentical(self.path("one.bp"), self.path("two.bp"))
+
+
+@unittest.skipIf(ad is None, "adios2 is not installed")
+class TestReadAttribute(unittest.TestCase):
+    def test_integers_parsed_from_metadata_match_reads(self):
+        attributes = {
+            "scalar": np.int32(3),
+            "one": np.array([7], dtype=np.int32),
+            "array": np.array([1, 2, -3], dtype=np.int16),
+            "char": np.int8(-5),
+            "uint64_max": np.uint64(np.iinfo(np.uint64).max),
+            "int64_min": np.int64(np.iinfo(np.int64).min),
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "atts.bp")
+            with ad.Stream(path, "w") as s:
+                for _ in s.steps(1):
+                    for name, value in attributes.items():
+                        s.write_attribute(name, value)
+
+            with ad.FileReader(path) as f:
+                infos = f.available_attributes()
+                self.assertEqual(infos.keys(), attributes.keys())
+                for name, info in infos.items():
+                    with self.subTest(attribute=name, value=info["Value"]):
+                        self.assertIn(info["Type"], INTEGER_TYPES)
+                        parsed = read_attribute(f, name, info)
+                        expected = f.read_attribute(name)
+                        self.assertEqual(np.ndim(parsed), np.ndim(expected))
+                        self.assertEqual(np.asarray(parsed).dtype, np.asarray(expected).dtype)
+                        np.testing.assert_array_equal(parsed, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
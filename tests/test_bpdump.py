@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from bpcmp.bpdump import SUMMARY_BYTES, read_edges
+
+try:
+    import adios2 as ad
+except ImportError:
+    ad = None
+
+
+@unittest.skipIf(ad is None, "adios2 is not installed")
+class TestReadEdges(unittest.TestCase):
+    def test_summary_matches_full_read(self):
+        rng = np.random.default_rng(0)
+        variables = {
+            "vector": rng.normal(size=200_000),
+            "cube": rng.normal(size=(70, 5, 1201)),
+            "short_axes": rng.normal(size=(3, 2, 90_000)),
+            "ints": rng.integers(-1000, 1000, size=400_000).astype(np.int32),
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "large.bp")
+            with ad.Stream(path, "w") as s:
+                for _ in s.steps(1):
+                    for name, value in variables.items():
+                        s.write(name, value, list(value.shape), [0] * value.ndim, list(value.shape))
+
+            with ad.FileReader(path) as f:
+                for name, value in variables.items():
+                    with self.subTest(variable=name):
+                        self.assertGreater(value.nbytes, SUMMARY_BYTES)
+                        var = f.inquire_variable(name)
+                        full = str(f.read(var))
+                        with np.printoptions(threshold=0):
+                            edges = str(read_edges(f, var))
+                        self.assertEqual(edges, full)
+
+
+if __name__ == "__main__":
+    unittest.main()
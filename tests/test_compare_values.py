@@ -0,0 +1,51 @@
+import unittest
+
+import numpy as np
+
+from bpcmp.bpcmp import compare_values
+
+
+class TestIntegerArrays(unittest.TestCase):
+    def test_signed_difference_does_not_wrap(self):
+        same, maxdiff = compare_values(np.array([-128], np.int8), np.array([127], np.int8), 0, 3)
+        self.assertFalse(same)
+        self.assertEqual(maxdiff, 255)
+
+    def test_unsigned_difference_does_not_wrap(self):
+        same, maxdiff = compare_values(np.array([5, 10, 200], np.uint8), np.array([3, 10, 201], np.uint8), 0, 3)
+        self.assertTrue(same)
+        self.assertEqual(maxdiff, 2)
+
+    def test_unsigned_relative_tolerance(self):
+        same, _ = compare_values(np.array([100, 0], np.uint16), np.array([101, 0], np.uint16), 0.01, 0)
+        self.assertTrue(same)
+        same, _ = compare_values(np.array([0, 65535], np.uint16), np.array([0, 0], np.uint16), 0.01, 0)
+        self.assertFalse(same)
+
+
+class TestScalars(unittest.TestCase):
+    def test_tolerances_apply_to_scalars(self):
+        self.assertTrue(compare_values(np.float64(1.0), np.float64(1.0 + 1e-9), 0, 1e-6)[0])
+        self.assertTrue(compare_values(np.array(1.0), np.array(1.0 + 1e-9), 0, 1e-6)[0])
+        self.assertFalse(compare_values(np.float64(1.0), np.float64(1.0 + 1e-9), 0, 0)[0])
+
+    def test_scalar_infinities_and_nans(self):
+        self.assertTrue(compare_values(np.inf, np.inf, 1e-3, 0)[0])
+        self.assertFalse(compare_values(1.0, np.inf, 1e-3, 0)[0])
+        self.assertTrue(compare_values(np.nan, np.nan, 0, 0)[0])
+        self.assertFalse(compare_values(1.0, np.nan, 0, 1)[0])
+
+    def test_integer_scalars_do_not_wrap(self):
+        same, maxdiff = compare_values(np.int8(-128), np.int8(127), 0, 3)
+        self.assertFalse(same)
+        self.assertEqual(maxdiff, 255)
+
+
+class TestStrings(unittest.TestCase):
+    def test_strings_compare_for_equality(self):
+        self.assertEqual(compare_values("abc", "abc", 0, 0), (True, 0))
+        self.assertEqual(compare_values("abc", "abd", 0, 0), (False, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()